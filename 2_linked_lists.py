@@ -3,6 +3,9 @@
 # How would you solve this problem if a temporary buffer is  not allowed?
 
 import collections
+from typing import Any, Optional
+
+from LinkedList import LinkedList, LlNode
 
 
 def dedupe_fast(self) -> None:
@@ -14,10 +17,13 @@ def dedupe_fast(self) -> None:
     while current is not None:
         if current.data in seen:
             prev.next = current.next
+            self._size -= 1
         else:
             seen.add(current.data)
             prev = current
         current = current.next
+    self.tail = prev
+    self.invalidate_index()
 
 
 def dedupe_slow(self) -> None:
@@ -28,9 +34,13 @@ def dedupe_slow(self) -> None:
         while pointer_2.next is not None:
             if pointer_2.next.data == pointer_1.data:
                 pointer_2.next = pointer_2.next.next
+                self._size -= 1
             else:
                 pointer_2 = pointer_2.next
+        # Each pass of the inner loop ends on the last node.
+        self.tail = pointer_2
         pointer_1 = pointer_1.next
+    self.invalidate_index()
 
 
 # [list.append(random.randint(0, 100)) for _ in range(1000)]
@@ -38,6 +48,242 @@ def dedupe_slow(self) -> None:
 #   dedupe_slow_t.timeit(number=1000) == 1.8594063
 
 
+# For lists too long to keep a set of every value, `dedupe` can instead sort
+# the nodes by value, which needs no hashing, or check values against a Bloom
+# filter of fixed size. The Bloom filter can report a value it hasn't seen as
+# seen, so that strategy drops roughly ``error_rate`` of the unique nodes in
+# exchange for bounded memory.
+
+import math
+from itertools import islice
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+_MASK_64 = (1 << 64) - 1
+# Nodes are checked against a Bloom filter in batches this size with NumPy.
+_BLOOM_BATCH = 4096
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & _MASK_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return x ^ (x >> 31)
+
+
+def _splitmix64_np(x: np.ndarray) -> np.ndarray:
+    # uint64 arithmetic wraps, which stands in for the masking above.
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class BloomFilter:
+    """A set which may report false positives, but never false negatives,
+    using a fixed amount of memory.
+
+    Items are hashed with ``hash()``, so a filter is only meaningful within
+    one process.
+
+    Args:
+        capacity: The number of items the filter is sized for.
+        error_rate: The false positive rate wanted at ``capacity`` items.
+        max_bytes: An upper limit on the size of the bit array. If the limit
+            is hit, the actual false positive rate will exceed ``error_rate``.
+
+    Attributes:
+        _bits: The bit array.
+        _n_bits: The number of bits in ``_bits``.
+        _n_hashes: The number of bits set per item.
+    """
+
+    _bits: bytearray
+    _n_bits: int
+    _n_hashes: int
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.01,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError("`error_rate` must be between 0 and 1.")
+
+        capacity = max(capacity, 1)
+        n_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes is not None:
+            n_bits = min(n_bits, max_bytes * 8)
+        self._n_bits = max(n_bits, 8)
+        self._n_hashes = max(round(self._n_bits / capacity * math.log(2)), 1)
+        self._bits = bytearray((self._n_bits + 7) // 8)
+
+    def add(self, item: Any) -> bool:
+        """Adds ``item`` to the filter.
+
+        Returns:
+            `True` if ``item`` was probably already in the filter, `False` if it
+            definitely wasn't.
+        """
+        # Double hashing: the k bit positions are h1 + i * h2.
+        hash_ = _splitmix64(hash(item) & _MASK_64)
+        pos, step = hash_ & 0xFFFFFFFF, (hash_ >> 32) | 1
+        bits, n_bits = self._bits, self._n_bits
+        seen = True
+        for _ in range(self._n_hashes):
+            pos %= n_bits
+            byte, bit = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & bit:
+                seen = False
+                bits[byte] |= bit
+            pos += step
+
+        return seen
+
+    def add_many(self, items: Sequence) -> np.ndarray:
+        """Adds each of ``items`` to the filter, setting the same bits as `add`.
+
+        Returns:
+            A boolean array marking the items which were probably already in
+            the filter, or which repeat an earlier item in ``items``.
+        """
+        hashes = np.array([hash(item) for item in items], dtype=np.int64)
+        hash_ = _splitmix64_np(hashes.view(np.uint64))
+        pos, step = hash_ & np.uint64(0xFFFFFFFF), (hash_ >> np.uint64(32)) | 1
+        k = np.arange(self._n_hashes, dtype=np.uint64)
+        pos = (pos[:, None] + step[:, None] * k) % np.uint64(self._n_bits)
+
+        bits = np.frombuffer(self._bits, dtype=np.uint8)
+        byte, bit = pos >> np.uint64(3), np.left_shift(1, pos & 7).astype(np.uint8)
+        seen = (bits[byte] & bit).all(axis=1)
+        _, first = np.unique(hashes, return_index=True)
+        repeat = np.ones(len(hashes), dtype=bool)
+        repeat[first] = False
+        np.bitwise_or.at(bits, byte.ravel(), bit.ravel())
+
+        return seen | repeat
+
+    def __contains__(self, item: Any) -> bool:
+        hash_ = _splitmix64(hash(item) & _MASK_64)
+        pos, step = hash_ & 0xFFFFFFFF, (hash_ >> 32) | 1
+        for _ in range(self._n_hashes):
+            pos %= self._n_bits
+            if not self._bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+            pos += step
+
+        return True
+
+
+def dedupe_stream(
+    nodes: Iterable[LlNode],
+    strategy: str = "set",
+    capacity: int = 1 << 20,
+    error_rate: float = 0.01,
+    max_bytes: Optional[int] = None,
+) -> Iterator[LlNode]:
+    """Yields the first node seen with each value from a possibly unbounded
+    iterable of nodes. The "bloom" strategy reads ahead `_BLOOM_BATCH` nodes
+    at a time.
+
+    Args:
+        nodes: The nodes to dedupe.
+        strategy: "set" to remember every value exactly, or "bloom" to use a
+            `BloomFilter`.
+        capacity, error_rate, max_bytes: Passed to `BloomFilter`.
+
+    Raises:
+        ValueError: If ``strategy`` isn't "set" or "bloom".
+    """
+    if strategy == "set":
+        seen = set()
+        for node in nodes:
+            if node.data not in seen:
+                seen.add(node.data)
+                yield node
+    elif strategy == "bloom":
+        bloom = BloomFilter(capacity, error_rate, max_bytes)
+        nodes = iter(nodes)
+        while True:
+            batch = list(islice(nodes, _BLOOM_BATCH))
+            if not batch:
+                return
+            seen = bloom.add_many([node.data for node in batch])
+            for node, was_seen in zip(batch, seen.tolist()):
+                if not was_seen:
+                    yield node
+    else:
+        raise ValueError("`strategy` must be 'set' or 'bloom' when streaming.")
+
+
+def _dedupe_sorted(self) -> Iterator[LlNode]:
+    """Yields the first node with each value, in list order, by stably sorting
+    the node positions by value.
+    """
+    nodes = list(self)
+    order = sorted(range(len(nodes)), key=lambda idx: nodes[idx].data)
+    keep = bytearray(len(nodes))
+    prev_data = None
+    for rank, idx in enumerate(order):
+        if rank == 0 or nodes[idx].data != prev_data:
+            keep[idx] = 1
+            prev_data = nodes[idx].data
+
+    return (node for node, kept in zip(nodes, keep) if kept)
+
+
+def dedupe(
+    self,
+    strategy: str = "set",
+    error_rate: float = 0.01,
+    max_bytes: Optional[int] = None,
+) -> None:
+    """Removes duplicate items from list, keeping the first of each.
+
+    Args:
+        strategy: "set" to track seen values in a set, "sort" to sort the
+            nodes by value (for orderable values), or "bloom" to track them in
+            a `BloomFilter` sized for the list.
+        error_rate, max_bytes: Passed to `BloomFilter`.
+
+    Raises:
+        ValueError: If ``strategy`` isn't "set", "sort" or "bloom".
+    """
+    if strategy not in ("set", "sort", "bloom"):
+        raise ValueError("`strategy` must be 'set', 'sort' or 'bloom'.")
+
+    if strategy == "sort":
+        kept = _dedupe_sorted(self)
+    else:
+        kept = dedupe_stream(self, strategy, len(self), error_rate, max_bytes)
+
+    # Iterating over the list reads each node's next before it is yielded, so
+    # the kept nodes can be relinked as they arrive.
+    prev, size = None, 0
+    for node in kept:
+        if prev is None:
+            self.head = node
+        else:
+            prev.next = node
+        prev = node
+        size += 1
+    if prev is not None:
+        prev.next = None
+    self.tail, self._size = prev, size
+    self.invalidate_index()
+
+
+# some_list.dedupe("bloom", error_rate=0.01)
+
+# 1,000,000 random ints, ~632,000 unique   seconds   peak MiB   nodes lost
+# dedupe_fast                              0.58209      48.00            0
+# dedupe("set")                            0.57203      48.00            0
+# dedupe("sort")                           1.82877      61.03            0
+# dedupe("bloom")                          0.86144       2.19           93
+
+
 # ----
 # 2. Return Kth to Last: Implement an algorithm to find the kth to last element of a singly linked list.
 
@@ -46,13 +292,14 @@ def k_to_last_sized(self, k: int) -> LlNode:
     """Finds the kth last element of a singly linked list where the size of the
     list is known.
     """
-    if not 0 <= k < len(self):
-        raise IndexError(f"`k` must be between 0 and {len(self)}.")
+    size = len(self)
+    if not 0 <= k < size:
+        raise IndexError(f"`k` must be between 0 and {size}.")
 
     current = self.head
     idx = 0
     while current is not None:
-        if len(self) - 1 - idx == k:
+        if size - 1 - idx == k:
             return current
         current = current.next
         idx += 1
@@ -95,6 +342,25 @@ def k_to_last_helper(self, k, node, idx) -> int:
     return size
 
 
+# For many queries against a slowly changing list, `LinkedList.build_index`
+# keeps a reference to every 64th node. The recursive version above also
+# exceeds the recursion limit on lists longer than ~1000 nodes.
+#
+# some_list.build_index()
+# some_list.kth_to_last(k)
+
+# 1,000,000 nodes     per query
+# k_to_last_sized     0.07334
+# kth_to_last         0.00000 (2.7e-06), after a 0.04063 index build
+
+# Popping from the middle keeps the index in step by moving each later indexed
+# node on by one, rather than rebuilding it.
+#
+# 1,000,000 nodes, pop(len // 2) + kth_to_last(1000)   per round
+# without an index                                     0.04069
+# with build_index()                                   0.00105
+
+
 # ----
 # 3. Delete Middle Node: Implement an algorithm to delete a node in the middle (i.e., any node but
 # the first and last node, not necessarily the exact middle) of a singly linked list, given only access to
@@ -109,8 +375,14 @@ def delete_middle_node(self, node: LlNode) -> None:
     if node == self.head or node == self.tail:
         raise ValueError("node cannot be the first or last element of the list.")
 
-    node.data = node.next.data
-    node.next = node.next.next
+    removed = node.next
+    if removed is self.tail:
+        self.tail = node
+    node.data = removed.data
+    node.next = removed.next
+    self._size -= 1
+    if self._index is not None:
+        self._index.removed_node(removed)
 
 
 # ----
@@ -139,7 +411,9 @@ def partition(self, x: int) -> None:
         left.head = right.head
     else:
         left.tail.next = right.head
-    self.head, self.tail = left.head, right.tail
+    self.head = left.head
+    self.tail = left.tail if right.tail is None else right.tail
+    self.invalidate_index()
 
 
 def partition_deque(self, x: int) -> collections.deque:
@@ -156,6 +430,97 @@ def partition_deque(self, x: int) -> collections.deque:
     return d_q
 
 
+# Partitioning by relinking the existing nodes in a single pass. Each bucket
+# keeps its own head and tail, so the relative order within a bucket is kept
+# and no nodes or lists are allocated. `partition_multi` sorts values into
+# k + 1 buckets around k pivots, using a binary search for each value.
+
+from bisect import bisect_right
+from typing import Callable, List
+
+
+def partition_inplace(self, x: Any, key: Optional[Callable] = None) -> None:
+    """Stably partitions a linked list around ``x`` by relinking its nodes.
+
+    Args:
+        x: Nodes whose value is less than ``x`` are moved before the rest.
+        key: An optional function giving the value to compare for each item.
+    """
+    less_head = less_tail = more_head = more_tail = None
+    node = self.head
+    while node is not None:
+        next_node = node.next
+        if (node.data if key is None else key(node.data)) < x:
+            if less_tail is None:
+                less_head = node
+            else:
+                less_tail.next = node
+            less_tail = node
+        else:
+            if more_tail is None:
+                more_head = node
+            else:
+                more_tail.next = node
+            more_tail = node
+        node = next_node
+
+    if more_tail is not None:
+        more_tail.next = None
+    if less_tail is None:
+        self.head, self.tail = more_head, more_tail
+    else:
+        less_tail.next = more_head
+        self.head = less_head
+        self.tail = less_tail if more_tail is None else more_tail
+    self.invalidate_index()
+
+
+def partition_multi(self, pivots: List, key: Optional[Callable] = None) -> None:
+    """Stably partitions a linked list into ``len(pivots) + 1`` buckets by
+    relinking its nodes. Values less than ``pivots[0]`` come first, then those
+    from ``pivots[0]`` up to ``pivots[1]``, and so on.
+
+    Args:
+        pivots: The bucket boundaries, in ascending order.
+        key: An optional function giving the value to compare for each item.
+    """
+    heads = [None] * (len(pivots) + 1)
+    tails = [None] * (len(pivots) + 1)
+    node = self.head
+    while node is not None:
+        next_node = node.next
+        bucket = bisect_right(pivots, node.data if key is None else key(node.data))
+        if tails[bucket] is None:
+            heads[bucket] = node
+        else:
+            tails[bucket].next = node
+        tails[bucket] = node
+        node = next_node
+
+    self.head = self.tail = None
+    for head, tail in zip(heads, tails):
+        if head is None:
+            continue
+        if self.tail is None:
+            self.head = head
+        else:
+            self.tail.next = head
+        self.tail = tail
+    if self.tail is not None:
+        self.tail.next = None
+    self.invalidate_index()
+
+
+# some_list.partition_multi([250, 500, 750])
+
+# 1,000,000 random ints < 1000        seconds
+# partition(500)                      0.19159
+# partition_inplace(500)              0.08287
+# partition_multi([250, 500, 750])    0.18004
+# ArrayLinkedList.partition(500)      0.04938
+# ArrayLinkedList.partition_multi     0.10583
+
+
 # ----
 # 5. Sum Lists: You have two numbers represented by a linked list, where each node contains a single
 # digit. The digits are stored  in reverse order, such that the 1's digit is at the head of the list. Write a
@@ -196,10 +561,11 @@ def sum_lists(self, ll_1: LinkedList, ll_2: LinkedList) -> LinkedList:
     """
     from itertools import zip_longest
 
+    len_1, len_2 = len(ll_1), len(ll_2)
     step, sum_ = 0, 0
     for num_1, num_2 in zip_longest(ll_1, ll_2, fillvalue=LlNode(0)):
-        sum_ += num_1.data * 10 ** (len(ll_1) - 1 - step)
-        sum_ += num_2.data * 10 ** (len(ll_2) - 1 - step)
+        sum_ += num_1.data * 10 ** (len_1 - 1 - step)
+        sum_ += num_2.data * 10 ** (len_2 - 1 - step)
         step += 1
 
     result = LinkedList()
@@ -209,21 +575,213 @@ def sum_lists(self, ll_1: LinkedList, ll_2: LinkedList) -> LinkedList:
     return result
 
 
+# Both solutions above go through a Python int, raising 10 to a growing power
+# for every digit, and `str()` refuses ints of more than 4300 digits by default.
+# The functions below instead work through the digits once, propagating the
+# carry or borrow like long arithmetic on paper. Forward order lists are read
+# onto a stack (a Python list) first, so no recursion or padding is needed.
+# Any ``base`` works. With base 10**9 each node holds nine decimal digits,
+# which `pack_limbs` and `unpack_limbs` convert to and from.
+
+from itertools import repeat, zip_longest
+
+LIMB_BASE = 10 ** 9
+
+
+def _limbs(ll: LinkedList, forward: bool) -> Iterator[int]:
+    """Yields the digits of ``ll``, least significant first."""
+    if forward:
+        return reversed([node.data for node in ll])
+    return (node.data for node in ll)
+
+
+def _from_limbs(limbs: Iterable[int], forward: bool) -> LinkedList:
+    if forward:
+        result = LinkedList(reversed(list(limbs)))
+    else:
+        result = LinkedList(limbs)
+    if result.is_empty():
+        result.append(0)
+
+    return result
+
+
+def _add_limbs(
+    limbs_1: Iterable[int], limbs_2: Iterable[int], base: int
+) -> Iterator[int]:
+    # Zero limbs are held back until a non-zero limb follows, so that leading
+    # zeros in the inputs don't end up in the sum.
+    carry = zeros = 0
+    for limb_1, limb_2 in zip_longest(limbs_1, limbs_2, fillvalue=0):
+        total = limb_1 + limb_2 + carry
+        if total >= base:
+            total -= base
+            carry = 1
+        else:
+            carry = 0
+        if not total:
+            zeros += 1
+            continue
+        if zeros:
+            yield from repeat(0, zeros)
+            zeros = 0
+        yield total
+    if carry:
+        yield from repeat(0, zeros)
+        yield carry
+
+
+def _sub_limbs(limbs_1: Iterable[int], limbs_2: Iterable[int], base: int) -> List[int]:
+    result = []
+    borrow = 0
+    for limb_1, limb_2 in zip_longest(limbs_1, limbs_2, fillvalue=0):
+        diff = limb_1 - limb_2 - borrow
+        if diff < 0:
+            result.append(diff + base)
+            borrow = 1
+        else:
+            result.append(diff)
+            borrow = 0
+    if borrow:
+        raise ValueError("`ll_1` must not be less than `ll_2`.")
+
+    while len(result) > 1 and result[-1] == 0:
+        result.pop()
+    return result
+
+
+def _mul_limbs(limbs_1: Iterable[int], limbs_2: Iterable[int], base: int) -> List[int]:
+    limbs_1, limbs_2 = list(limbs_1), list(limbs_2)
+    result = [0] * (len(limbs_1) + len(limbs_2))
+    for offset, limb_1 in enumerate(limbs_1):
+        if not limb_1:
+            continue
+        carry = 0
+        pos = offset
+        for limb_2 in limbs_2:
+            carry, result[pos] = divmod(result[pos] + limb_1 * limb_2 + carry, base)
+            pos += 1
+        while carry:
+            carry, result[pos] = divmod(result[pos] + carry, base)
+            pos += 1
+
+    while len(result) > 1 and result[-1] == 0:
+        result.pop()
+    return result
+
+
+def add_digit_lists(
+    ll_1: LinkedList, ll_2: LinkedList, base: int = 10, forward: bool = False
+) -> LinkedList:
+    """Adds two numbers stored one digit per node, in a single pass.
+
+    Args:
+        ll_1, ll_2: The numbers to add. Each digit must be less than ``base``.
+        base: The base of the digits.
+        forward: Whether the most significant digit is at the head of the
+            lists, rather than the least significant.
+
+    Returns:
+        The sum, in the same format.
+    """
+    limbs = _add_limbs(_limbs(ll_1, forward), _limbs(ll_2, forward), base)
+    return _from_limbs(limbs, forward)
+
+
+def sub_digit_lists(
+    ll_1: LinkedList, ll_2: LinkedList, base: int = 10, forward: bool = False
+) -> LinkedList:
+    """Subtracts ``ll_2`` from ``ll_1``, in the format of `add_digit_lists`.
+
+    Raises:
+        ValueError: If ``ll_1`` is less than ``ll_2``.
+    """
+    limbs = _sub_limbs(_limbs(ll_1, forward), _limbs(ll_2, forward), base)
+    return _from_limbs(limbs, forward)
+
+
+def mul_digit_lists(
+    ll_1: LinkedList, ll_2: LinkedList, base: int = 10, forward: bool = False
+) -> LinkedList:
+    """Multiplies two numbers by long multiplication, in the format of
+    `add_digit_lists`.
+    """
+    limbs = _mul_limbs(_limbs(ll_1, forward), _limbs(ll_2, forward), base)
+    return _from_limbs(limbs, forward)
+
+
+def pack_limbs(
+    ll: LinkedList, limb_digits: int = 9, forward: bool = False
+) -> LinkedList:
+    """Packs a list of decimal digits into a list of base 10 ** ``limb_digits``
+    limbs, in the same order.
+    """
+    limbs = []
+    limb, scale, count = 0, 1, 0
+    for digit in _limbs(ll, forward):
+        limb += digit * scale
+        scale *= 10
+        count += 1
+        if count == limb_digits:
+            limbs.append(limb)
+            limb, scale, count = 0, 1, 0
+    if count:
+        limbs.append(limb)
+
+    while len(limbs) > 1 and limbs[-1] == 0:
+        limbs.pop()
+    return _from_limbs(limbs, forward)
+
+
+def unpack_limbs(
+    ll: LinkedList, limb_digits: int = 9, forward: bool = False
+) -> LinkedList:
+    """Unpacks a list of base 10 ** ``limb_digits`` limbs into a list of
+    decimal digits, in the same order.
+    """
+    limbs = list(_limbs(ll, forward))
+    digits = []
+    for limb in limbs[:-1]:
+        for _ in range(limb_digits):
+            limb, digit = divmod(limb, 10)
+            digits.append(digit)
+    top = limbs[-1] if limbs else 0
+    while top:
+        top, digit = divmod(top, 10)
+        digits.append(digit)
+
+    while len(digits) > 1 and digits[-1] == 0:
+        digits.pop()
+    return _from_limbs(digits, forward)
+
+
+# add_digit_lists(LinkedList([7, 1, 6]), LinkedList([5, 9, 2]))  # 2 -> 1 -> 9
+# add_digit_lists(LinkedList([6, 1, 7]), LinkedList([2, 9, 5]), forward=True)
+# packed = pack_limbs(LinkedList(digits))
+# unpack_limbs(mul_digit_lists(packed, packed, LIMB_BASE))
+
+# digits    sum_llists   sum_lists   add (base 10)   add (base 10**9)
+# 4000         0.08878     0.16090         0.00444            0.00052
+# 100000             -           -         0.09971            0.00799
+# 1000000            -           -         1.22023            0.09442
+
+# digits    mul (base 10)   mul (base 10**9)
+# 4000            2.42948            0.04087
+
 # ----
 # 6. Palindrome: Implement a function to check if a linked list is a palindrome.
 
 
 def is_palindrome(ll: LinkedList) -> bool:
     """Checks if the items in a linked list form a palindrome."""
-    from queue import LifoQueue
-
-    stack = LifoQueue()
+    size = len(ll)
+    stack = []
     for idx, node in enumerate(ll):
-        if idx < len(ll) // 2:
-            stack.put(node)
-        elif len(ll) / 2 == idx + 0.5:
+        if idx < size // 2:
+            stack.append(node)
+        elif size / 2 == idx + 0.5:
             pass
-        elif node.data != stack.get().data:
+        elif node.data != stack.pop().data:
             return False
 
     return True
@@ -235,25 +793,73 @@ def is_palindrome_2(ll: LinkedList) -> bool:
     Similar to the above, but avoids the unnecessary check performed on each iteration
     to see if we are currently checking the middle node of a list of odd length.
     """
-    from queue import LifoQueue
-
-    stack = LifoQueue()
+    size = len(ll)
+    stack = []
     current = ll.head
     idx = 0
-    while idx < len(ll) // 2:
-        stack.put(current)
+    while idx < size // 2:
+        stack.append(current)
         current = current.next
         idx += 1
-    if len(ll) % 2 == 1:
+    if size % 2 == 1:
         current = current.next
     while current is not None:
-        if current.data != stack.get().data:
+        if current.data != stack.pop().data:
             return False
         current = current.next
 
     return True
 
 
+def _reverse_chain(node: Optional[LlNode]) -> Optional[LlNode]:
+    """Reverses the chain of nodes starting at ``node``, returning its new head."""
+    prev = None
+    while node is not None:
+        node.next, prev, node = prev, node, node.next
+
+    return prev
+
+
+def is_palindrome_inplace(ll: LinkedList) -> bool:
+    """Checks if the items in a linked list form a palindrome using O(1)
+    additional space.
+
+    Finds the middle with a slow and a fast pointer, then reverses the second
+    half in place to compare it with the first. The second half is reversed
+    back afterwards, even if comparing the items raises, so the list is only
+    modified while the check runs.
+    """
+    if ll.head is None:
+        return True
+
+    slow, fast = ll.head, ll.head.next
+    while fast is not None and fast.next is not None:
+        slow, fast = slow.next, fast.next.next
+
+    # `slow` is now the last node of the first half.
+    second_half = _reverse_chain(slow.next)
+    try:
+        left, right = ll.head, second_half
+        while right is not None:
+            if left.data != right.data:
+                return False
+            left, right = left.next, right.next
+        return True
+    finally:
+        slow.next = _reverse_chain(second_half)
+
+
+# 1,000,000 node palindrome                 seconds
+# is_palindrome, with queue.LifoQueue       2.28560
+# is_palindrome_2, with queue.LifoQueue     2.25381
+# is_palindrome                             0.27024
+# is_palindrome_2                           0.08012
+# is_palindrome_inplace                     0.07375
+# ArrayLinkedList("q").is_palindrome        0.01055
+# ArrayLinkedList("q"), scattered nodes     0.17626
+# ArrayLinkedList (list payloads)           0.13267
+
+
 # ----
 # 7. Intersection: Given two (singly) linked lists, determine if the two lists intersect. Return the inter-
 # secting node. Note that the intersection is defined based on reference, not value. That is, if the kth
@@ -299,6 +905,123 @@ def intersection_o1_space(ll_1: LinkedList, ll_2: LinkedList) -> Optional[LlNode
         smaller, bigger = smaller.next, bigger.next
 
 
+# Intersections between many lists. Once two singly linked lists share a node
+# they share every node after it, so lists which intersect share a tail and
+# form a tree rooted at it. `IntersectionTracker` records the list and
+# position of each node it walks, keyed by id(). A new list is only walked up
+# to the first node already recorded, which is where it joins an earlier list,
+# so each node is visited once across all lists. The node shared by every
+# list in a group is the join closest to the tail.
+
+from typing import Dict, Tuple
+
+
+class IntersectionTracker:
+    """Groups linked lists which intersect, adding one list at a time.
+
+    Lists must not contain loops, and must not be relinked once added.
+
+    Attributes:
+        _owner: The (list index, position) of each node walked, keyed by the
+            node's id().
+        _heads: The head of each list, keeping the recorded nodes alive so
+            their ids aren't reused.
+        _last_pos: The position of the tail node in each list.
+        _parent: The union-find parent of each list index.
+        _merge: The distance to the tail and the node shared by every list in
+            each group, keyed by the group's root list index.
+    """
+
+    _owner: Dict[int, Tuple[int, int]]
+    _heads: List[Optional[LlNode]]
+    _last_pos: List[int]
+    _parent: List[int]
+    _merge: Dict[int, Tuple[int, LlNode]]
+
+    def __init__(self) -> None:
+        self._owner = {}
+        self._heads = []
+        self._last_pos = []
+        self._parent = []
+        self._merge = {}
+
+    def _find(self, list_idx: int) -> int:
+        parent = self._parent
+        root = list_idx
+        while parent[root] != root:
+            root = parent[root]
+        while parent[list_idx] != root:
+            parent[list_idx], list_idx = root, parent[list_idx]
+
+        return root
+
+    def add(self, ll: LinkedList) -> Optional[LlNode]:
+        """Adds ``ll``, walking only the nodes no earlier list contains.
+
+        Returns:
+            The node at which ``ll`` joins an earlier list, or `None`.
+        """
+        list_idx = len(self._heads)
+        self._heads.append(ll.head)
+        self._parent.append(list_idx)
+
+        owner = self._owner
+        node, pos = ll.head, 0
+        while node is not None:
+            seen = owner.get(id(node))
+            if seen is not None:
+                other_idx, other_pos = seen
+                dist = self._last_pos[other_idx] - other_pos
+                self._last_pos.append(pos + dist)
+
+                root = self._find(other_idx)
+                self._parent[list_idx] = root
+                merge = self._merge.get(root)
+                if merge is None or dist < merge[0]:
+                    self._merge[root] = (dist, node)
+                return node
+
+            owner[id(node)] = (list_idx, pos)
+            node = node.next
+            pos += 1
+
+        self._last_pos.append(pos - 1)
+        return None
+
+    def group(self, list_idx: int) -> int:
+        """Returns the index of the first list added to ``list_idx``'s group."""
+        return self._find(list_idx)
+
+    def merge_points(self) -> List[Tuple[List[int], LlNode]]:
+        """Returns, for each group of two or more intersecting lists, the
+        indices of the lists and the first node they all share.
+        """
+        members = {}
+        for list_idx in range(len(self._parent)):
+            members.setdefault(self._find(list_idx), []).append(list_idx)
+
+        return [(members[root], node) for root, (_, node) in self._merge.items()]
+
+
+def intersection_many(lists: Iterable[LinkedList]) -> List[Tuple[List[int], LlNode]]:
+    """Finds every group of intersecting lists among ``lists`` and the first
+    node shared by each whole group, in one pass over the nodes.
+    """
+    tracker = IntersectionTracker()
+    for ll in lists:
+        tracker.add(ll)
+
+    return tracker.merge_points()
+
+
+# tracker = IntersectionTracker()
+# for ll in incoming_lists:
+#     join = tracker.add(ll)
+
+# 1000 lists of up to 1000 nodes, in 100 groups sharing tails     seconds
+# intersection_o1_space on every pair                              19.97260
+# intersection_many                                                 0.50132
+
 # ----
 # 8. Loop Detection: Given a circular linked list, implement an algorithm that returns
 # the node at the beginning of the loop.
@@ -312,14 +1035,8 @@ def intersection_o1_space(ll_1: LinkedList, ll_2: LinkedList) -> Optional[LlNode
 
 def is_loop(self) -> Optional[LlNode]:
     slow, fast = self.head, self.head
-    count = 0
-    while fast is not None:
-        count += 1
-        slow = slow.next
-        try:
-            fast = fast.next.next  # Jump 2 ahead.
-        except AttributeError:
-            fast = None
+    while fast is not None and fast.next is not None:
+        slow, fast = slow.next, fast.next.next  # Jump 2 ahead.
         if fast is slow:
             return fast
 
@@ -339,3 +1056,167 @@ def find_loop_start(self, collision_node: LlNode) -> LlNode:
 # if collision_node:
 #     loop_start = some_list.find_loop_start(collision_node)
 #     print(loop_start)
+
+
+# Brent's algorithm finds the loop length with a single moving pointer: the
+# other jumps to it at every power of two, so it moves far fewer times than
+# Floyd's pair of pointers. Knowing the length, a pointer started that many
+# nodes ahead of the head meets one started at the head at the loop's start.
+# `CycleScan` keeps its pointers between calls, so a scan of a huge list can
+# be run a bounded number of steps at a time.
+
+import sys
+from dataclasses import dataclass
+
+
+@dataclass
+class CycleInfo:
+    start: LlNode
+    length: int
+    tail_length: int
+
+
+class CycleScan:
+    """A resumable search for a loop in the nodes following ``head``.
+
+    Args:
+        head: The first node to scan from.
+
+    Attributes:
+        done: Whether the scan has finished.
+        result: The loop found, once ``done``, or `None` if there isn't one.
+        _head: The first node.
+        _phase: 0 while finding the loop length, 1 while moving the lead
+            pointer that many nodes ahead, and 2 while finding the loop start.
+        _tortoise, _hare: The two pointers.
+        _power, _length: The current power of two and the steps taken by the
+            hare since the tortoise last jumped to it.
+        _steps: The steps taken by the hare or both pointers in phases 1 and 2.
+    """
+
+    done: bool
+    result: Optional[CycleInfo]
+
+    def __init__(self, head: Optional[LlNode]) -> None:
+        self.done = head is None
+        self.result = None
+        self._head = head
+        self._phase = 0
+        self._tortoise = head
+        self._hare = None if head is None else head.next
+        self._power = self._length = 1
+        self._steps = 0
+
+    def run(self, budget: Optional[int] = None) -> bool:
+        """Advances the scan by at most ``budget`` pointer moves, or until it
+        finishes if ``budget`` is `None`.
+
+        Returns:
+            Whether the scan has finished.
+        """
+        if self.done:
+            return True
+        remaining = sys.maxsize if budget is None else budget
+        tortoise, hare = self._tortoise, self._hare
+
+        # The pointers are moved by `for` loops over ranges with early breaks,
+        # which cost less per move in CPython than counting in a `while` loop.
+        if self._phase == 0:
+            power, length = self._power, self._length
+            while remaining and hare is not None and tortoise is not hare:
+                if power == length:
+                    tortoise = hare
+                    power *= 2
+                    length = 0
+                for moved in range(1, min(power - length, remaining) + 1):
+                    hare = hare.next
+                    if hare is None or hare is tortoise:
+                        break
+                length += moved
+                remaining -= moved
+            self._power, self._length = power, length
+            if hare is None:
+                self.done = True
+                return True
+            if tortoise is not hare:
+                self._tortoise, self._hare = tortoise, hare
+                return False
+            self._phase = 1
+            tortoise = hare = self._head
+
+        if self._phase == 1:
+            moves = min(self._length - self._steps, remaining)
+            for _ in range(moves):
+                hare = hare.next
+            self._steps += moves
+            remaining -= moves
+            if self._steps < self._length:
+                self._tortoise, self._hare = tortoise, hare
+                return False
+            self._phase, self._steps = 2, 0
+
+        moved = 0
+        if tortoise is not hare:
+            for moved in range(1, remaining + 1):
+                tortoise, hare = tortoise.next, hare.next
+                if tortoise is hare:
+                    break
+        self._tortoise, self._hare = tortoise, hare
+        self._steps += moved
+        if tortoise is not hare:
+            return False
+
+        self.done = True
+        self.result = CycleInfo(tortoise, self._length, self._steps)
+        return True
+
+
+def detect_cycle(self) -> Optional[CycleInfo]:
+    """Returns the start, length and tail length of the loop in a linked
+    list, or `None` if it doesn't loop.
+    """
+    scan = CycleScan(self.head)
+    scan.run()
+
+    return scan.result
+
+
+# print(some_list.detect_cycle())
+#
+# scan = CycleScan(some_list.head)
+# while not scan.run(budget=1_000_000):
+#     pass  # Do other work between slices.
+# print(scan.result)
+
+# 1,000,000 nodes, best of 3         is_loop +          ... + a lap to   detect_cycle
+#                                    find_loop_start    find the length
+# loop back to node 0                        0.15546            0.23398        0.09636
+# loop back to node 500,000                  0.04257            0.08983        0.06630
+# loop back to node 999,999                  0.08490            0.08543        0.10458
+# no loop                                    0.02736                  -        0.05265
+
+
+# ----
+# The solutions above which take `self` are written as methods of `LinkedList`,
+# so bind them to it, e.g. `some_list.dedupe_fast()`.
+
+for _method in (
+    dedupe_fast,
+    dedupe_slow,
+    dedupe,
+    k_to_last_sized,
+    k_to_last_unsized,
+    print_k_to_last,
+    k_to_last_helper,
+    delete_middle_node,
+    partition,
+    partition_deque,
+    partition_inplace,
+    partition_multi,
+    sum_llists,
+    sum_lists,
+    is_loop,
+    find_loop_start,
+    detect_cycle,
+):
+    setattr(LinkedList, _method.__name__, _method)
@@ -0,0 +1,786 @@
+"""A singly linked list used by the solutions in `2_linked_lists.py` and
+`3_stacks_and_queues.py`.
+
+Nodes use ``__slots__``, which roughly halves their size compared to a node
+with a ``__dict__``, and the list caches its length so ``len()`` is O(1). For
+append/pop heavy workloads a `NodePool` can be shared between lists, so that
+nodes released by the caller are reused rather than reallocated.
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+
+class LlNode:
+    """A node in a singly linked list.
+
+    Attributes:
+        data: The value held by the node.
+        next: The following node, or `None` at the end of the list.
+    """
+
+    __slots__ = ("data", "next")
+
+    def __init__(self, data: Any = None, next: Optional["LlNode"] = None) -> None:
+        self.data = data
+        self.next = next
+
+    def __repr__(self) -> str:
+        return f"LlNode({self.data!r})"
+
+
+class NodePool:
+    """A free list of spare nodes.
+
+    A node released to the pool must no longer be referenced anywhere else, as
+    it will be handed out again by `acquire`.
+
+    Args:
+        max_size: The most spare nodes to keep. Further releases are left to
+            the garbage collector.
+
+    Attributes:
+        max_size: The most spare nodes to keep.
+        _free: The spare nodes.
+    """
+
+    max_size: int
+    _free: List[LlNode]
+
+    def __init__(self, max_size: int = 1 << 16) -> None:
+        self.max_size = max_size
+        self._free = []
+
+    def acquire(self, data: Any = None) -> LlNode:
+        """Returns a spare node holding ``data``, or a new one if there are
+        none spare.
+        """
+        if self._free:
+            node = self._free.pop()
+            node.data = data
+            return node
+        return LlNode(data)
+
+    def release(self, node: LlNode) -> None:
+        """Returns ``node`` to the pool, dropping its references so the old
+        data and any following nodes can be freed.
+        """
+        if len(self._free) < self.max_size:
+            node.data = node.next = None
+            self._free.append(node)
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+
+class ChunkIndex:
+    """An index of every ``block``th node of a `LinkedList`, so the node at any
+    position can be reached by jumping to the nearest indexed node and walking
+    fewer than ``block`` nodes.
+
+    Appending at either end and popping the head update the index in O(1).
+    Removing any other node moves each indexed node after it on by one node, in
+    O(n / ``block``). Relinking nodes directly marks the index stale, and it is
+    rebuilt in O(n) on the next lookup. The index holds about n / ``block``
+    references.
+
+    Args:
+        ll: The list to index.
+        block: The distance between indexed nodes.
+
+    Attributes:
+        block: The distance between indexed nodes.
+        stale: Whether the index must be rebuilt before it is next used.
+        _marks: The indexed nodes. Those before ``_start`` have been popped.
+        _start: The index in ``_marks`` of the first live indexed node.
+        _offset: The position in the list of the first live indexed node.
+    """
+
+    block: int
+    stale: bool
+    _marks: List[LlNode]
+    _start: int
+    _offset: int
+
+    def __init__(self, ll: "LinkedList", block: int = 64) -> None:
+        if block < 1:
+            raise ValueError("`block` must be at least 1.")
+
+        self.block = block
+        self.rebuild(ll)
+
+    def rebuild(self, ll: "LinkedList") -> None:
+        self._marks = list(islice(ll, 0, None, self.block))
+        self._start = 0
+        self._offset = 0
+        self.stale = False
+
+    def node_at(self, ll: "LinkedList", pos: int) -> LlNode:
+        """Returns the node at ``pos``, which must be in range."""
+        if self.stale:
+            self.rebuild(ll)
+
+        if pos < self._offset:
+            node, steps = ll.head, pos
+        else:
+            mark, steps = divmod(pos - self._offset, self.block)
+            node = self._marks[self._start + mark]
+        for _ in range(steps):
+            node = node.next
+
+        return node
+
+    def appended(self, node: LlNode, pos: int) -> None:
+        if not self.stale and pos >= self._offset:
+            if (pos - self._offset) % self.block == 0:
+                self._marks.append(node)
+
+    def prepended(self, node: LlNode) -> None:
+        if self.stale:
+            return
+        self._offset += 1
+        if self._offset == self.block:
+            if self._start:
+                self._start -= 1
+                self._marks[self._start] = node
+            else:
+                self._marks.insert(0, node)
+            self._offset = 0
+
+    def popped_head(self) -> None:
+        if self.stale:
+            return
+        self._offset -= 1
+        if self._offset < 0:
+            # The first live indexed node was the head.
+            self._start += 1
+            self._offset += self.block
+            if self._start > len(self._marks) // 2:
+                del self._marks[: self._start]
+                self._start = 0
+
+    def _advance(self, first: int) -> None:
+        # Each indexed node from ``first`` on is replaced by the node which has
+        # moved into its position. The last one falls off the end of the list
+        # if it was the tail.
+        marks = self._marks
+        for idx in range(first, len(marks)):
+            marks[idx] = marks[idx].next
+        if len(marks) > self._start and marks[-1] is None:
+            marks.pop()
+
+    def removed(self, pos: int) -> None:
+        """Updates the index after the node at ``pos`` > 0 is unlinked. The
+        unlinked node's ``next`` must not have been cleared yet.
+        """
+        if self.stale:
+            return
+        first = max(0, -(-(pos - self._offset) // self.block))
+        self._advance(self._start + first)
+
+    def removed_node(self, node: LlNode) -> None:
+        """As `removed`, for when only the unlinked node is known. The first
+        indexed node at or after it is found by walking at most ``block``
+        nodes.
+        """
+        if self.stale:
+            return
+        live = {
+            mark: idx
+            for idx, mark in enumerate(self._marks[self._start :], self._start)
+        }
+        for _ in range(self.block):
+            if node is None:
+                return
+            if node in live:
+                self._advance(live[node])
+                return
+            node = node.next
+
+
+class LinkedList:
+    """A singly linked list with head and tail references and a cached length.
+
+    Iterating over the list yields its nodes rather than their data, as the
+    solutions to the book's problems work with nodes. Any code which relinks
+    nodes directly must keep ``tail`` and ``_size`` up to date, and call
+    `invalidate_index`.
+
+    Args:
+        items: Values with which to fill the list.
+        pool: An optional `NodePool` from which new nodes are acquired. Popped
+            nodes are never released to it automatically, as the caller may
+            still hold them. Release a node from `pop_node` explicitly once
+            nothing references it.
+
+    Attributes:
+        head: The first node, or `None` if the list is empty.
+        tail: The last node, or `None` if the list is empty.
+        _size: The number of nodes in the list.
+        _pool: The node pool, if any.
+        _index: A `ChunkIndex` of the nodes, once `build_index` is called.
+    """
+
+    head: Optional[LlNode]
+    tail: Optional[LlNode]
+    _size: int
+    _pool: Optional[NodePool]
+    _index: Optional[ChunkIndex]
+
+    def __init__(self, items: Iterable = (), pool: Optional[NodePool] = None) -> None:
+        self.head = None
+        self.tail = None
+        self._size = 0
+        self._pool = pool
+        self._index = None
+        self.extend(items)
+
+    @classmethod
+    def from_iterable(
+        cls, items: Iterable, pool: Optional[NodePool] = None
+    ) -> "LinkedList":
+        return cls(items, pool)
+
+    def _new_node(self, data: Any) -> LlNode:
+        if isinstance(data, LlNode):
+            data.next = None
+            return data
+        if self._pool is not None:
+            return self._pool.acquire(data)
+        return LlNode(data)
+
+    def append(self, data: Any) -> LlNode:
+        """Appends ``data`` to the end of the list. If ``data`` is already a
+        node, the node itself is appended.
+
+        Returns:
+            The appended node.
+        """
+        if isinstance(data, LlNode):
+            node = data
+            node.next = None
+        elif self._pool is not None:
+            node = self._pool.acquire(data)
+        else:
+            node = LlNode(data)
+
+        if self.tail is None:
+            self.head = node
+        else:
+            self.tail.next = node
+        self.tail = node
+        self._size += 1
+        if self._index is not None:
+            self._index.appended(node, self._size - 1)
+
+        return node
+
+    def appendleft(self, data: Any) -> LlNode:
+        """Inserts ``data`` at the start of the list.
+
+        Returns:
+            The inserted node.
+        """
+        node = self._new_node(data)
+        node.next = self.head
+        self.head = node
+        if self.tail is None:
+            self.tail = node
+        self._size += 1
+        if self._index is not None:
+            self._index.prepended(node)
+
+        return node
+
+    def extend(self, items: Iterable) -> None:
+        """Appends every item in ``items``, linking them into a chain before
+        attaching it to the list.
+        """
+        new_node = self._new_node
+        dummy = LlNode()
+        last = dummy
+        count = 0
+        for item in items:
+            last.next = last = new_node(item)
+            count += 1
+        if not count:
+            return
+
+        if self.tail is None:
+            self.head = dummy.next
+        else:
+            self.tail.next = dummy.next
+        self.tail = last
+        self._size += count
+
+        if self._index is not None:
+            node = dummy.next
+            for pos in range(self._size - count, self._size):
+                self._index.appended(node, pos)
+                node = node.next
+
+    def pop(self, idx: int = -1) -> Any:
+        """Removes the node at ``idx`` and returns its data. See `pop_node`."""
+        return self.pop_node(idx).data
+
+    def pop_node(self, idx: int = -1) -> LlNode:
+        """Unlinks the node at ``idx`` and returns it. Once nothing else
+        references the node, it can be handed to `NodePool.release` for reuse.
+
+        Popping the head is O(1). Any other index is O(``idx``), as the
+        previous node has to be found. Once `build_index` is called, finding it
+        takes O(``block``) and updating the index O(n / ``block``).
+
+        Raises:
+            IndexError: If the list is empty or ``idx`` is out of range.
+        """
+        if not self._size:
+            raise IndexError("Popped empty list.")
+        if idx < 0:
+            idx += self._size
+        if not 0 <= idx < self._size:
+            raise IndexError(
+                f"`idx` must be between {-self._size} and {self._size - 1}."
+            )
+
+        index = self._index
+        if idx == 0:
+            node = self.head
+            self.head = node.next
+            if self.head is None:
+                self.tail = None
+            if index is not None:
+                index.popped_head()
+        else:
+            if index is None or idx - 1 < index.block:
+                prev = self.head
+                for _ in range(idx - 1):
+                    prev = prev.next
+            else:
+                prev = index.node_at(self, idx - 1)
+            node = prev.next
+            prev.next = node.next
+            if node is self.tail:
+                self.tail = prev
+            if index is not None:
+                index.removed(idx)
+        self._size -= 1
+        node.next = None
+
+        return node
+
+    def build_index(self, block: int = 64) -> None:
+        """Indexes every ``block``th node, so `node_at` and `kth_to_last` take
+        O(``block``) rather than O(n).
+        """
+        self._index = ChunkIndex(self, block)
+
+    def invalidate_index(self) -> None:
+        """Marks the index as stale after nodes are relinked directly."""
+        if self._index is not None:
+            self._index.stale = True
+
+    def node_at(self, pos: int) -> LlNode:
+        """Returns the node at position ``pos``, counting from 0.
+
+        Raises:
+            IndexError: If ``pos`` is out of range.
+        """
+        if not 0 <= pos < self._size:
+            raise IndexError(f"`pos` must be between 0 and {self._size}.")
+
+        if self._index is not None:
+            return self._index.node_at(self, pos)
+        node = self.head
+        for _ in range(pos):
+            node = node.next
+
+        return node
+
+    def kth_to_last(self, k: int) -> LlNode:
+        """Returns the kth to last node, where the last node is the 0th.
+
+        Raises:
+            IndexError: If ``k`` is out of range.
+        """
+        if not 0 <= k < self._size:
+            raise IndexError(f"`k` must be between 0 and {self._size}.")
+
+        return self.node_at(self._size - 1 - k)
+
+    def is_empty(self) -> bool:
+        return self.head is None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[LlNode]:
+        # The next node is read before yielding, so callers may relink the
+        # yielded node, as `partition` does.
+        node = self.head
+        while node is not None:
+            next_node = node.next
+            yield node
+            node = next_node
+
+    def __str__(self) -> str:
+        return " -> ".join(str(node.data) for node in self)
+
+
+class ArrayLinkedList:
+    """A singly linked list stored as a struct of arrays.
+
+    Node ``i`` holds ``data[i]`` and links to node ``next_idx[i]``, with -1
+    marking the end of the list. Traversals chase ints through flat arrays
+    rather than pointers between objects, and passes which only relink nodes,
+    such as `dedupe` and `partition`, are done with NumPy over the whole list
+    at once. Relinking never moves data, so an index keeps referring to the
+    same node, just as a node reference would. `compact` rewrites the arrays
+    into list order once the links have become scattered.
+
+    Args:
+        items: Values with which to fill the list.
+        typecode: An `array` typecode for the payloads, e.g. "q" or "d". If
+            `None`, the payloads are kept in a list.
+
+    Attributes:
+        data: The payload of every node.
+        next_idx: The index of the node following each node, or -1.
+        head: The index of the first node, or -1 if the list is empty.
+        tail: The index of the last node, or -1 if the list is empty.
+        _size: The number of nodes in the list.
+    """
+
+    data: Union[list, array]
+    next_idx: array
+    head: int
+    tail: int
+    _size: int
+
+    def __init__(self, items: Iterable = (), typecode: Optional[str] = None) -> None:
+        self.data = list(items) if typecode is None else array(typecode, items)
+        self._link_in_order()
+
+    @classmethod
+    def from_linked_list(
+        cls, ll: LinkedList, typecode: Optional[str] = None
+    ) -> "ArrayLinkedList":
+        """Copies the node based ``ll`` into a new array backed list. A loop in
+        ``ll`` is preserved as a link from the last node back into the list.
+        """
+        index = {}
+        items = []
+        node = ll.head
+        while node is not None and node not in index:
+            index[node] = len(items)
+            items.append(node.data)
+            node = node.next
+
+        arr_ll = cls(items, typecode)
+        if node is not None:
+            arr_ll.next_idx[arr_ll.tail] = index[node]
+
+        return arr_ll
+
+    def to_linked_list(self) -> LinkedList:
+        """Copies the list into a new node based `LinkedList`, preserving any
+        loop.
+        """
+        ll = LinkedList(self.data[idx] for idx in self.indices())
+        if ll.tail is not None and self.next_idx[self.tail] != -1:
+            # Find the node the loop returns to by its position in the list.
+            loop_pos = int(np.flatnonzero(self._order() == self.next_idx[self.tail])[0])
+            node = ll.head
+            for _ in range(loop_pos):
+                node = node.next
+            ll.tail.next = node
+
+        return ll
+
+    def _link_in_order(self) -> None:
+        """Links every node in ``data`` into a list in storage order."""
+        n = len(self.data)
+        self.next_idx = array("l", range(1, n + 1))
+        if n:
+            self.next_idx[-1] = -1
+        self.head, self.tail = (0, n - 1) if n else (-1, -1)
+        self._size = n
+
+    def _np(self, arr: array) -> np.ndarray:
+        # A writable view. It must not outlive the call using it, as the array
+        # can't be resized while the view exists.
+        return np.frombuffer(arr, dtype=arr.typecode)
+
+    def _in_order(self) -> bool:
+        """Returns whether the nodes are stored in list order, with no gaps."""
+        n = self._size
+        return (
+            self.head == 0
+            and n == len(self.next_idx)
+            and np.array_equal(self._np(self.next_idx)[:-1], np.arange(1, n))
+        )
+
+    def _order(self) -> np.ndarray:
+        """Returns the node indices in list order. Walks at most ``_size``
+        nodes, so it is safe to call on a list with a loop.
+        """
+        n = self._size
+        if self._in_order():
+            return np.arange(n)
+
+        next_idx = self.next_idx
+        order = array("l", bytes(n * next_idx.itemsize))
+        idx = self.head
+        for pos in range(n):
+            order[pos] = idx
+            idx = next_idx[idx]
+
+        return np.array(order, dtype=next_idx.typecode)
+
+    def _values(self, order: np.ndarray) -> Union[list, np.ndarray]:
+        if isinstance(self.data, array):
+            return self._np(self.data)[order]
+        data = self.data
+        return [data[idx] for idx in order.tolist()]
+
+    def _relink(self, order: np.ndarray) -> None:
+        """Relinks the nodes in ``order`` into a list, dropping the rest."""
+        self._size = len(order)
+        if not self._size:
+            self.head = self.tail = -1
+            return
+
+        next_idx = self._np(self.next_idx)
+        next_idx[order[:-1]] = order[1:]
+        next_idx[order[-1]] = -1
+        self.head, self.tail = int(order[0]), int(order[-1])
+
+    def append(self, data: Any) -> int:
+        """Appends ``data`` to the end of the list.
+
+        Returns:
+            The index of the new node.
+        """
+        idx = len(self.data)
+        self.data.append(data)
+        self.next_idx.append(-1)
+        if self.tail == -1:
+            self.head = idx
+        else:
+            self.next_idx[self.tail] = idx
+        self.tail = idx
+        self._size += 1
+
+        return idx
+
+    def compact(self) -> None:
+        """Rewrites the arrays so the nodes are stored in list order, freeing
+        the slots of removed nodes. Node indices change.
+        """
+        order = self._order()
+        loop_to = self.next_idx[self.tail] if self._size else -1
+        values = self._values(order)
+        if isinstance(self.data, array):
+            self.data = array(self.data.typecode, values.tobytes())
+        else:
+            self.data = values
+        self._link_in_order()
+        if loop_to != -1:
+            self.next_idx[-1] = int(np.flatnonzero(order == loop_to)[0])
+
+    def dedupe(self) -> None:
+        """Removes every node whose payload appeared earlier in the list."""
+        order = self._order()
+        values = self._values(order)
+        if isinstance(values, np.ndarray):
+            _, first = np.unique(values, return_index=True)
+            keep = order[np.sort(first)]
+        else:
+            seen = set()
+            keep = [
+                idx
+                for idx, val in zip(order.tolist(), values)
+                if not (val in seen or seen.add(val))
+            ]
+            keep = np.array(keep, dtype=order.dtype)
+        self._relink(keep)
+
+    def partition(self, x: Any, key: Optional[Callable] = None) -> None:
+        """Stably moves every node with a payload less than ``x`` before the
+        rest. ``key`` optionally gives the value to compare for each payload.
+        """
+        if key is not None:
+            self.partition_multi([x], key)
+            return
+
+        order = self._order()
+        values = self._values(order)
+        if isinstance(values, np.ndarray):
+            less = values < x
+        else:
+            less = np.array([val < x for val in values], dtype=bool)
+        self._relink(np.concatenate((order[less], order[~less])))
+
+    def partition_multi(self, pivots: List, key: Optional[Callable] = None) -> None:
+        """Stably sorts the nodes into ``len(pivots) + 1`` buckets, where
+        bucket i holds payloads from ``pivots[i - 1]`` up to ``pivots[i]``.
+
+        Args:
+            pivots: The bucket boundaries, in ascending order.
+            key: An optional function giving the value to compare for each
+                payload. Without one, typed payloads are bucketed with NumPy.
+        """
+        order = self._order()
+        values = self._values(order)
+        if key is None and isinstance(values, np.ndarray):
+            buckets = np.searchsorted(np.asarray(pivots), values, side="right")
+        else:
+            if isinstance(values, np.ndarray):
+                values = values.tolist()
+            if key is not None:
+                values = map(key, values)
+            buckets = np.array(
+                [bisect_right(pivots, val) for val in values], dtype=np.intp
+            )
+        self._relink(order[np.argsort(buckets, kind="stable")])
+
+    def is_palindrome(self) -> bool:
+        """Checks if the payloads form a palindrome. Typed payloads stored in
+        list order are compared against a reversed memoryview of themselves,
+        without copying.
+        """
+        half = self._size // 2
+        if isinstance(self.data, array) and self._in_order():
+            with memoryview(self.data) as view:
+                return view[:half] == view[::-1][:half]
+
+        values = self._values(self._order())
+        if isinstance(values, np.ndarray):
+            return np.array_equal(values[:half], values[::-1][:half])
+        return values[:half] == values[::-1][:half]
+
+    def k_to_last(self, k: int) -> int:
+        """Returns the index of the kth to last node.
+
+        Raises:
+            IndexError: If ``k`` is out of range.
+        """
+        if not 0 <= k < self._size:
+            raise IndexError(f"`k` must be between 0 and {self._size}.")
+
+        next_idx = self.next_idx
+        idx = self.head
+        for _ in range(self._size - 1 - k):
+            idx = next_idx[idx]
+
+        return idx
+
+    def find_loop(self) -> int:
+        """Returns the index of the node at the start of a loop, or -1 if the
+        list doesn't loop.
+        """
+        # There are only len(next_idx) nodes, so a walk of that many steps
+        # which hasn't reached the end must have ended up inside a loop.
+        next_idx = self.next_idx
+        idx = self.head
+        for _ in range(len(next_idx)):
+            if idx == -1:
+                return -1
+            idx = next_idx[idx]
+        if idx == -1:
+            return -1
+
+        loop_len = 1
+        probe = next_idx[idx]
+        while probe != idx:
+            probe = next_idx[probe]
+            loop_len += 1
+
+        # Two pointers loop_len nodes apart meet at the start of the loop.
+        ahead = behind = self.head
+        for _ in range(loop_len):
+            ahead = next_idx[ahead]
+        while ahead != behind:
+            ahead, behind = next_idx[ahead], next_idx[behind]
+
+        return behind
+
+    def intersection(self, head_1: int, head_2: int) -> int:
+        """Returns the index of the first node shared by the chains starting at
+        ``head_1`` and ``head_2``, which both live in this list's arrays, or -1
+        if they don't meet.
+        """
+        next_idx = self.next_idx
+        # 1 marks nodes on the first chain, 2 those on the second, which stops
+        # either walk going round a loop forever.
+        chain = bytearray(len(next_idx))
+        idx = head_1
+        while idx != -1 and not chain[idx]:
+            chain[idx] = 1
+            idx = next_idx[idx]
+
+        idx = head_2
+        while idx != -1 and chain[idx] != 2:
+            if chain[idx]:
+                return idx
+            chain[idx] = 2
+            idx = next_idx[idx]
+
+        return -1
+
+    def indices(self) -> Iterator[int]:
+        """Yields the node indices in list order."""
+        next_idx = self.next_idx
+        idx = self.head
+        for _ in range(self._size):
+            yield idx
+            idx = next_idx[idx]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Yields the payloads in list order."""
+        data = self.data
+        for idx in self.indices():
+            yield data[idx]
+
+    def __str__(self) -> str:
+        return " -> ".join(str(val) for val in self)
+
+
+# Memory per item, measured with tracemalloc over 1,000,000 appends:
+#   LlNode with __slots__        48 bytes
+#   LlNode with a __dict__       88 bytes
+#   collections.deque             8 bytes (the deque only stores pointers)
+#
+# pool = NodePool()
+# ll, d = LinkedList(pool=pool), deque()
+# for i in range(n): ll.append(i); pool.release(ll.pop_node(0))
+# for i in range(n): d.append(i); d.popleft()
+
+# n = 1,000,000, best of 5   LinkedList   LinkedList + NodePool   deque
+# n appends, n pops             1.05403                 1.07389   0.08029
+# append + pop, n times         0.66478                 0.56709   0.04632
+
+# CPython already keeps free lists for small objects, so the pool makes little
+# difference to throughput. Its benefit is that a steady append/pop workload
+# stops allocating altogether, which keeps the garbage collector quiet. Nodes
+# are only recycled when the caller releases them, as a popped node may still
+# be referenced.
+
+# ArrayLinkedList with typecode "q" stores a node in 16 bytes, a third of an
+# LlNode, before counting the payload objects an LlNode also points to.
+#
+# n random ints            dedupe   partition   k_to_last(n // 2)   loop check
+# LinkedList, 10**6       0.59396     0.25581             0.09049      0.10153
+# ArrayLinkedList, 10**6  0.25719     0.04728             0.03610      0.08325
+# ArrayLinkedList, 10**7  3.36105     0.44645             0.43154      0.99415
+#
+# The passes above ran on a list stored in order. Once relinking has scattered
+# the nodes, finding the list order is a Python walk again: a second partition
+# of the 10**7 list took 2.11273s. `compact` restores the fast path.
@@ -16,6 +16,156 @@ def is_prime(n):
 # print(is_prime(67280421310721))
 
 
+# Trial division is O(sqrt(n)) per candidate, which is far too slow for batches
+# of 64-bit integers. Small inputs are answered from a cached sieve, everything
+# else goes through a deterministic Miller-Rabin test.
+
+import functools
+from typing import Iterable, Iterator, List
+
+# Jim Sinclair's 7 witnesses are deterministic for every 64-bit integer, the
+# first 13 primes (2 to 41) are deterministic for every n < 3.3 * 10 ** 24. The
+# first 12 alone are not, 318665857834031151167461 is a strong pseudoprime to
+# all of them.
+_MR_BASES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_SMALL_LIMIT = 1 << 16
+# Sieving base primes up to sqrt(2 ** 40) = 2 ** 20 takes ~1 MB, above this the
+# base primes alone would take gigabytes.
+_RANGE_LIMIT = 1 << 40
+
+
+@functools.lru_cache(maxsize=None)
+def small_prime_sieve(limit: int = _SMALL_LIMIT) -> bytearray:
+    """Returns a sieve of Eratosthenes where ``sieve[i]`` is 1 if i is prime.
+
+    Cached so the sieve is only built once per ``limit`` per process.
+    """
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytes(len(range(i * i, limit + 1, i)))
+    return sieve
+
+
+@functools.lru_cache(maxsize=None)
+def _small_primes(limit: int = _SMALL_LIMIT) -> List[int]:
+    sieve = small_prime_sieve(limit)
+    return [i for i in range(limit + 1) if sieve[i]]
+
+
+def _miller_rabin(n: int) -> bool:
+    """Deterministic Miller-Rabin for odd n > _SMALL_LIMIT (n < 3.3 * 10 ** 24)."""
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in _MR_BASES_64 if n < 1 << 64 else _MR_BASES:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime_fast(n: int) -> bool:
+    """Checks if ``n`` is prime.
+
+    Inputs up to `_SMALL_LIMIT` are looked up in the cached sieve, larger inputs
+    are trial divided by the first few primes and then tested with Miller-Rabin.
+    The result is exact for all n < 3.3 * 10 ** 24 (so every 64-bit integer) and
+    probabilistic above that.
+    """
+    if n <= _SMALL_LIMIT:
+        return n >= 2 and bool(small_prime_sieve()[n])
+    for p in _MR_BASES:
+        if n % p == 0:
+            return False
+    return _miller_rabin(n)
+
+
+def is_prime_many(nums: Iterable[int], progress: bool = False) -> List[bool]:
+    """Checks the primality of every integer in ``nums``.
+
+    Args:
+        nums: The candidates to check.
+        progress: Show a tqdm progress bar. Off by default as the bar costs more
+            than the check itself for small inputs.
+
+    Returns:
+        A list of bools in the same order as ``nums``.
+    """
+    sieve = small_prime_sieve()
+    if progress:
+        nums = tqdm(nums)
+    res = []
+    for n in nums:
+        if n <= _SMALL_LIMIT:
+            res.append(n >= 2 and bool(sieve[n]))
+        else:
+            res.append(is_prime_fast(n))
+    return res
+
+
+def primes_in_range(
+    lo: int, hi: int, segment_size: int = _SMALL_LIMIT
+) -> Iterator[int]:
+    """Yields the primes in [lo, hi) using a segmented sieve.
+
+    Only one segment of ``segment_size`` bytes is held in memory at a time, so
+    dense ranges of candidates can be enumerated without testing each one. Base
+    primes above `_SMALL_LIMIT` are sieved per call rather than cached.
+
+    Raises:
+        ValueError: If ``hi`` is above `_RANGE_LIMIT` (2 ** 40).
+    """
+    if hi > _RANGE_LIMIT:
+        raise ValueError(f"`hi` must be at most {_RANGE_LIMIT}.")
+
+    lo = max(lo, 2)
+    base_limit = math.isqrt(hi) + 1
+    if base_limit <= _SMALL_LIMIT:
+        base_primes = _small_primes()
+    else:
+        sieve = small_prime_sieve.__wrapped__(base_limit)
+        base_primes = [i for i in range(base_limit + 1) if sieve[i]]
+    for seg_lo in range(lo, hi, segment_size):
+        seg_hi = min(seg_lo + segment_size, hi)
+        segment = bytearray([1]) * (seg_hi - seg_lo)
+        for p in base_primes:
+            if p * p >= seg_hi:
+                break
+            start = max(p * p, -(-seg_lo // p) * p)
+            segment[start - seg_lo :: p] = bytes(len(range(start, seg_hi, p)))
+        for idx, flag in enumerate(segment):
+            if flag:
+                yield seg_lo + idx
+
+
+# print(is_prime_fast(67280421310721))
+# print(is_prime_many([2, 97, 561, 67280421310721, 2 ** 61 - 1]))
+# print(is_prime_fast(318665857834031151167461))  # False, 399165290221 * 798330580441
+# print(list(primes_in_range(10 ** 12, 10 ** 12 + 100)))
+
+# import random
+# nums = [random.getrandbits(64) for _ in range(100_000)]
+# timeit.timeit(lambda: is_prime(67280421310721), number=1)
+# timeit.timeit(lambda: is_prime_fast(67280421310721), number=1000) / 1000
+# timeit.timeit(lambda: is_prime_many(nums), number=1)
+
+# is_prime(67280421310721)             4.57024
+# is_prime_fast(67280421310721)        0.00009
+# is_prime_many(100k random 64-bit)    0.54917
+
+
 # ----
 
 
@@ -31,6 +181,127 @@ def perms(str_: str, prefix: str):
 # perms("sam", "")
 
 
+# A lazy alternative to `perms`. Rather than slicing new strings on every call,
+# one list of characters is rearranged in place into the next lexicographic
+# permutation. Repeated characters are skipped for free as equal characters are
+# never swapped past each other.
+
+from collections import Counter
+from typing import Optional
+
+
+def next_permutation(chars: list) -> bool:
+    """Rearranges ``chars`` in place into its next lexicographic permutation.
+
+    Returns:
+        `True` if a next permutation exists, `False` if ``chars`` was the last
+        permutation (in which case it is reset to the first, i.e. sorted).
+    """
+    i = len(chars) - 2
+    while i >= 0 and chars[i] >= chars[i + 1]:
+        i -= 1
+    if i < 0:
+        chars.reverse()
+        return False
+
+    j = len(chars) - 1
+    while chars[j] <= chars[i]:
+        j -= 1
+    chars[i], chars[j] = chars[j], chars[i]
+    lo, hi = i + 1, len(chars) - 1
+    while lo < hi:
+        chars[lo], chars[hi] = chars[hi], chars[lo]
+        lo, hi = lo + 1, hi - 1
+    return True
+
+
+def count_perms(str_: str) -> int:
+    """Returns the number of distinct permutations of ``str_``."""
+    total = math.factorial(len(str_))
+    for count in Counter(str_).values():
+        total //= math.factorial(count)
+    return total
+
+
+def nth_permutation(str_: str, k: int) -> str:
+    """Returns the ``k``th (0 indexed) distinct permutation of ``str_`` in
+    lexicographic order, without generating any of the preceding ones.
+
+    Raises:
+        IndexError: If ``k`` is not less than `count_perms(str_)`.
+    """
+    total = count_perms(str_)
+    if not 0 <= k < total:
+        raise IndexError(f"`k` must be between 0 and {total - 1}.")
+
+    counts = Counter(str_)
+    keys = sorted(counts)
+    remaining = len(str_)
+    res = []
+    for _ in range(len(str_)):
+        for char in keys:
+            if not counts[char]:
+                continue
+            # The number of permutations of the remainder starting with `char`.
+            block = total * counts[char] // remaining
+            if k < block:
+                res.append(char)
+                counts[char] -= 1
+                total = block
+                remaining -= 1
+                break
+            k -= block
+
+    return "".join(res)
+
+
+def permutation_rank(perm: str) -> int:
+    """Returns the lexicographic index of ``perm`` amongst the distinct
+    permutations of its characters. The inverse of `nth_permutation`.
+    """
+    counts = Counter(perm)
+    keys = sorted(counts)
+    total = count_perms(perm)
+    remaining = len(perm)
+    rank = 0
+    for char in perm:
+        for smaller in keys:
+            if smaller == char:
+                break
+            if counts[smaller]:
+                rank += total * counts[smaller] // remaining
+        total = total * counts[char] // remaining
+        counts[char] -= 1
+        remaining -= 1
+
+    return rank
+
+
+def perms_gen(str_: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Lazily yields the distinct permutations of ``str_`` in lexicographic
+    order.
+
+    ``start`` and ``stop`` select a range of permutation indices, so the output
+    space can be split between workers, e.g. `perms_gen(s, 0, 1000)` and
+    `perms_gen(s, 1000, 2000)`.
+    """
+    total = count_perms(str_)
+    stop = total if stop is None else min(stop, total)
+    if start >= stop:
+        return
+
+    chars = list(nth_permutation(str_, start)) if start else sorted(str_)
+    for _ in range(stop - start):
+        yield "".join(chars)
+        next_permutation(chars)
+
+
+# for perm in perms_gen("sama"):
+#     print(perm)
+# print(nth_permutation("abcdefghij", 1_000_000))  # chidjbfgae
+# print(permutation_rank("chidjbfgae"))  # 1000000
+
+
 # ----
 
 
@@ -55,6 +326,100 @@ def _fib(n, memo):
 # print(all_fib(10))
 
 
+# `_fib` recurses once per index, so it hits the recursion limit at around
+# n = 1000, and `all_fib` starts from an empty memo on every call. Fast doubling
+# walks the bits of n iteratively using
+#   F(2k) = F(k) * (2F(k + 1) - F(k))
+#   F(2k + 1) = F(k) ** 2 + F(k + 1) ** 2
+# so a single index takes O(log n) steps. Small results are shared between
+# calls via a process wide LRU cache. The cache is bounded by entry count, not
+# memory, and F(n) has ~0.69n bits, so only results of up to about a kilobyte
+# are cached: n <= `_FIB_CACHE_MAX_N`, or any n with a 64-bit ``mod``.
+
+from typing import Dict, Tuple, Union
+
+_FIB_CACHE_SIZE = 4096
+_FIB_CACHE_MAX_N = 10 ** 4
+
+
+def _fib_pair(n: int, mod: Optional[int] = None) -> Tuple[int, int]:
+    """Returns (F(n), F(n + 1)), optionally reduced modulo ``mod``."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == "1":
+            c, d = d, c + d
+        if mod is not None:
+            c, d = c % mod, d % mod
+        a, b = c, d
+    return a, b
+
+
+@functools.lru_cache(maxsize=_FIB_CACHE_SIZE)
+def _fib_cached(n: int, mod: Optional[int] = None) -> int:
+    return _fib_pair(n, mod)[0]
+
+
+def fib(n: int, mod: Optional[int] = None) -> int:
+    """Returns the ``n``th Fibonacci number using fast doubling.
+
+    Results for n <= `_FIB_CACHE_MAX_N`, or with a ``mod`` below 2 ** 64, are
+    cached. Larger results are recomputed on each call.
+
+    Args:
+        n: The index of the Fibonacci number, F(0) = 0 and F(1) = 1.
+        mod: If given, F(n) % ``mod`` is returned instead. Intermediate values
+            are reduced as well, so huge indices stay cheap.
+
+    Raises:
+        ValueError: If ``n`` is negative or ``mod`` is less than 1.
+    """
+    if n < 0:
+        raise ValueError("`n` must be non-negative.")
+    if mod is not None and mod < 1:
+        raise ValueError("`mod` must be at least 1.")
+    if n <= _FIB_CACHE_MAX_N or (mod is not None and mod.bit_length() <= 64):
+        return _fib_cached(n, mod)
+    return _fib_pair(n, mod)[0]
+
+
+def fib_range(start: int, stop: int, mod: Optional[int] = None) -> Iterator[int]:
+    """Lazily yields F(start) ... F(stop - 1), optionally modulo ``mod``.
+
+    The first pair is found by fast doubling, every following number is a
+    single addition.
+
+    Raises:
+        ValueError: If ``start`` is negative or ``mod`` is less than 1.
+    """
+    if start < 0:
+        raise ValueError("`start` must be non-negative.")
+    if mod is not None and mod < 1:
+        raise ValueError("`mod` must be at least 1.")
+    a, b = _fib_pair(start, mod)
+    for _ in range(start, stop):
+        yield a
+        a, b = (b, (a + b) % mod) if mod is not None else (b, a + b)
+
+
+# print(fib(10 ** 6) % 10 ** 10, fib(10 ** 18, mod=10 ** 9 + 7))
+# for i, f in enumerate(fib_range(0, 10)):
+#     print(f"{i}: {f}")
+
+# _fib_cached.cache_clear()
+# timeit.timeit(lambda: _fib(n, [0] * (n + 1)), number=1)
+# timeit.timeit(lambda: _fib_pair(n)[0], number=1)
+
+# n            _fib        fib
+# 10        0.00000    0.00000
+# 900       0.00027    0.00000
+# 10 ** 4         -    0.00004
+# 10 ** 5         -    0.00186
+# 10 ** 6         -    0.10175
+# `_fib` raises RecursionError from n = 10 ** 4 with the default limit.
+
+
 # ----
 
 
@@ -101,6 +466,141 @@ def sqrt_helper(n, min, max):
 # print(sqrt(111222338559598866946777344))
 
 
+# `sqrt_helper` recurses once per bisection step (~90 frames for the example
+# above) and only finds perfect squares. Below is an iterative integer k-th root
+# which uses `math.isqrt` for square roots and Newton's method otherwise, plus a
+# vectorised version for arrays of uint64.
+
+import numpy as np
+
+_ROOT_MODES = ("floor", "ceil", "exact")
+
+
+def _iroot_floor(n: int, k: int) -> int:
+    """Returns floor(n ** (1 / k)) for n >= 0."""
+    if n < 2 or k == 1:
+        return n
+    if k == 2:
+        return math.isqrt(n)
+
+    # Start above the root, Newton's method then decreases monotonically to it.
+    x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x:
+            return x
+        x = y
+
+
+def iroot(n: int, k: int = 2, mode: str = "floor") -> Optional[int]:
+    """Returns the integer ``k``th root of ``n``.
+
+    Args:
+        n: The integer to find the root of. May only be negative for odd ``k``.
+        k: The degree of the root.
+        mode: "floor" or "ceil" to round the root down or up, or "exact" to
+            return the root only if ``n`` is a perfect ``k``th power.
+
+    Returns:
+        The root, or `None` in "exact" mode if ``n`` is not a perfect power.
+
+    Raises:
+        ValueError: For an unknown ``mode``, ``k`` < 1 or an even root of a
+            negative number.
+    """
+    if mode not in _ROOT_MODES:
+        raise ValueError(f"`mode` must be one of {_ROOT_MODES}.")
+    if k < 1:
+        raise ValueError("`k` must be at least 1.")
+    if n < 0:
+        if k % 2 == 0:
+            raise ValueError("Even roots of negative numbers are not real.")
+        # floor(-x) == -ceil(x) and vice versa.
+        flipped = {"floor": "ceil", "ceil": "floor", "exact": "exact"}[mode]
+        root = iroot(-n, k, flipped)
+        return None if root is None else -root
+
+    root = _iroot_floor(n, k)
+    if root ** k == n:
+        return root
+    if mode == "exact":
+        return None
+    return root + 1 if mode == "ceil" else root
+
+
+_UINT64_MAX = np.iinfo(np.uint64).max
+
+
+def _pow_le(base: np.ndarray, k: int, limit: np.ndarray) -> np.ndarray:
+    """Returns a mask of where ``base`` ** ``k`` <= ``limit`` without being
+    fooled by uint64 overflow.
+    """
+    fits = np.ones(base.shape, dtype=bool)
+    power = np.ones_like(base)
+    max_factor = _UINT64_MAX // np.maximum(base, 1)
+    for _ in range(k):
+        fits &= power <= max_factor
+        power = np.where(fits, power * base, 0)
+    return fits & (power <= limit)
+
+
+def iroot_array(arr, k: int = 2, mode: str = "floor") -> np.ndarray:
+    """Vectorised `iroot` for an array of non-negative integers.
+
+    A float estimate of every root is corrected to the exact integer root with
+    overflow-safe uint64 arithmetic, so results are exact for the full uint64
+    range.
+
+    Args:
+        arr: Array-like of non-negative integers, converted to uint64. NumPy
+            turns a list mixing ints either side of 2 ** 63 into floats, so
+            pass such values as ``np.array(values, dtype=np.uint64)``.
+        k: The degree of the root.
+        mode: As for `iroot`. In "exact" mode a masked array is returned where
+            non perfect powers are masked.
+
+    Raises:
+        TypeError: If ``arr`` is not an array of integers.
+        ValueError: If ``arr`` contains negative numbers.
+    """
+    if mode not in _ROOT_MODES:
+        raise ValueError(f"`mode` must be one of {_ROOT_MODES}.")
+    if k < 1:
+        raise ValueError("`k` must be at least 1.")
+    arr = np.asarray(arr)
+    if arr.dtype.kind not in "iu":
+        raise TypeError("`arr` must be an array of integers.")
+    if arr.dtype.kind == "i" and (arr < 0).any():
+        raise ValueError("`arr` must not contain negative numbers.")
+    arr = arr.astype(np.uint64)
+    if k == 1:
+        return np.ma.masked_array(arr, mask=False) if mode == "exact" else arr
+
+    root = np.floor(arr.astype(np.float64) ** (1.0 / k)).astype(np.uint64)
+    while True:
+        too_big = ~_pow_le(root, k, arr)
+        if not too_big.any():
+            break
+        root[too_big] -= 1
+    while True:
+        too_small = _pow_le(root + 1, k, arr)
+        if not too_small.any():
+            break
+        root[too_small] += 1
+
+    is_exact = root ** k == arr
+    if mode == "exact":
+        return np.ma.masked_array(root, mask=~is_exact)
+    if mode == "ceil":
+        root += ~is_exact
+    return root
+
+
+# print(iroot(111222338559598866946777344))  # 10546200195312
+# print(iroot(10 ** 30 + 1, 3, "ceil"), iroot(2 ** 64, 4, "exact"))
+# print(iroot_array(np.array([0, 15, 16, 2 ** 64 - 1], dtype=np.uint64)))
+
+
 # ----
 
 
@@ -117,6 +617,85 @@ def sum_digits(n):
 # print(sum_digits(12349123))
 
 
+# `sum_digits` peels one digit off one integer per loop. `digit_stats` works on
+# a whole array instead: each divmod pass strips four digits from every element
+# and looks up their digit sum in a table, so a uint64 needs at most 5 passes.
+# Python ints too large for an array are converted to decimal in chunks (`str`
+# refuses ints over 4300 digits by default) and tallied with `str.count`.
+
+_DIGIT_SUMS_10K = np.array([sum(map(int, str(i))) for i in range(10_000)], np.uint16)
+_POWERS_OF_10 = np.array([10 ** i for i in range(20)], dtype=np.uint64)
+_CHUNK_DIGITS = 4000
+
+
+def digit_stats(arr) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the digit sums, digit counts and digital roots of every integer
+    in ``arr``.
+
+    Negative numbers are treated as their absolute value.
+
+    Args:
+        arr: Array-like of integers which fit in an int64 or uint64.
+
+    Returns:
+        A tuple of arrays (digit sums, digit counts, digital roots), each the
+        same shape as ``arr``.
+    """
+    arr = np.asarray(arr)
+    if arr.dtype.kind == "i":
+        # abs() of the minimum int64 wraps, but has the right uint64 bits.
+        mag = np.abs(arr.astype(np.int64)).astype(np.uint64)
+    elif arr.dtype.kind == "u":
+        mag = arr.astype(np.uint64)
+    else:
+        raise TypeError("`arr` must be an array of integers.")
+
+    sums = np.zeros(mag.shape, dtype=np.uint16)
+    rem = mag
+    while True:
+        rem, low = np.divmod(rem, np.uint64(10_000))
+        sums += _DIGIT_SUMS_10K[low]
+        if not rem.any():
+            break
+
+    counts = np.maximum(np.searchsorted(_POWERS_OF_10, mag, side="right"), 1)
+    roots = np.where(mag == 0, 0, (mag - np.uint64(1)) % np.uint64(9) + np.uint64(1))
+
+    return sums, counts.astype(np.uint8), roots.astype(np.uint8)
+
+
+def digit_stats_int(n: int) -> Tuple[int, int, int]:
+    """Returns the digit sum, digit count and digital root of a single,
+    arbitrarily large, integer ``n``.
+    """
+    n = abs(n)
+    base = 10 ** _CHUNK_DIGITS
+    chunks = []
+    while n >= base:
+        n, low = divmod(n, base)
+        chunks.append(str(low))
+    chunks.append(str(n))
+
+    digit_sum = 0
+    for chunk in chunks:
+        digit_sum += sum(d * chunk.count(str(d)) for d in range(1, 10))
+    digit_count = _CHUNK_DIGITS * (len(chunks) - 1) + len(chunks[-1])
+    digital_root = 0 if digit_sum == 0 else (digit_sum - 1) % 9 + 1
+
+    return digit_sum, digit_count, digital_root
+
+
+# print(digit_stats(np.array([0, 9, 12349123, -45, 2 ** 63 - 1])))
+# print(digit_stats_int(12349123), digit_stats_int(7 ** 100_000))
+
+# ids = np.random.randint(0, 2 ** 63, 10_000_000, dtype=np.int64)
+# timeit.timeit(lambda: digit_stats(ids), number=1)
+# timeit.timeit(lambda: [sum(map(int, str(i))) for i in ids.tolist()], number=1)
+
+# digit_stats      1.12952
+# str/map/sum     38.03946
+
+
 # ----
 
 
@@ -125,7 +704,7 @@ def diff_k(k, arr):
     hash_t_arr = {x: x for x in arr}
     for item in arr:
         temp = [hash_t_arr.get(item - k), hash_t_arr.get(item + k)]
-        pairs.update([frozenset([item, x]) for x in temp if x])
+        pairs.update([frozenset([item, x]) for x in temp if x is not None])
 
     return list(map(tuple, pairs))
 
@@ -134,6 +713,111 @@ def diff_k(k, arr):
 # print(diff_k(2, arr))
 
 
+# `diff_k` allocates a frozenset per candidate pair. Sorting the distinct values
+# once lets pairs for any k be found with two pointers (or `np.searchsorted` for
+# arrays) and the sorted values can be reused across queries for different k.
+
+import itertools
+
+
+class DiffKIndex:
+    """The sorted distinct values of an array, which can be queried for pairs of
+    values with any difference k.
+
+    NumPy arrays are kept as arrays and queried with `np.searchsorted`, other
+    iterables are kept as sorted lists and queried with two pointers.
+
+    Attributes:
+        values: The distinct values of the array in ascending order.
+
+    Args:
+        arr: The integers to index.
+    """
+
+    values: Union[List[int], np.ndarray]
+
+    def __init__(self, arr: Iterable[int]) -> None:
+        if isinstance(arr, np.ndarray):
+            self.values = np.unique(arr)
+        else:
+            self.values = sorted(set(arr))
+
+    def pairs(self, k: int) -> Union[List[Tuple[int, int]], np.ndarray]:
+        """Returns every pair (x, x + k) where both values are in the array.
+
+        Pairs are returned in ascending order of x, as an (n, 2) array if the
+        index was built from a NumPy array.
+
+        Raises:
+            ValueError: If ``k`` is 0.
+        """
+        if k == 0:
+            raise ValueError("`k` must be non-zero.")
+        k = abs(k)
+        if isinstance(self.values, np.ndarray):
+            return self._pairs_np(k)
+
+        values = self.values
+        n = len(values)
+        res = []
+        j = 0
+        for x in values:
+            target = x + k
+            while j < n and values[j] < target:
+                j += 1
+            if j == n:
+                break
+            if values[j] == target:
+                res.append((x, target))
+        return res
+
+    def _pairs_np(self, k: int) -> np.ndarray:
+        values = self.values
+        targets = values + k
+        idx = np.searchsorted(values, targets)
+        found = idx < len(values)
+        found[found] = values[idx[found]] == targets[found]
+        return np.column_stack((values[found], targets[found]))
+
+    def pairs_many(self, ks: Iterable[int]) -> Dict[int, List[Tuple[int, int]]]:
+        """Returns the pairs for each difference in ``ks``, keyed by k."""
+        return {k: self.pairs(k) for k in ks}
+
+
+def diff_k_stream(
+    k: int, nums: Iterable[int], chunk_size: int = 65_536
+) -> Iterator[Tuple[int, int]]:
+    """Lazily yields the pairs (x, x + k) found in a stream of integers.
+
+    ``nums`` is consumed ``chunk_size`` items at a time and each pair is
+    yielded as soon as its second value arrives, so unbounded iterators can be
+    processed. Only the distinct values seen so far are kept.
+    """
+    if k == 0:
+        raise ValueError("`k` must be non-zero.")
+    k = abs(k)
+    seen = set()
+    nums = iter(nums)
+    while True:
+        chunk = list(itertools.islice(nums, chunk_size))
+        if not chunk:
+            return
+        for x in chunk:
+            if x in seen:
+                continue
+            if x - k in seen:
+                yield x - k, x
+            if x + k in seen:
+                yield x, x + k
+            seen.add(x)
+
+
+# index = DiffKIndex(arr)
+# print(index.pairs(2), index.pairs_many([1, 3, 5]))
+# print(DiffKIndex(np.array(arr)).pairs(2))
+# print(list(diff_k_stream(2, iter(arr))))
+
+
 # ----
 
 
@@ -161,3 +845,130 @@ def solve_ab_eq_cd(n):
 # # 1: 0.63079764 (brute force)
 # # 2: 0.57837134 (added break)
 # # 3: 0.13155724 (compute d)
+
+
+# O(n ** 2): group every (a, b) pair by its cube sum, then any two pairs in the
+# same group are a solution. No cube roots are taken, so there are no float
+# errors to worry about.
+
+import contextlib
+import io
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _cube_sum_pairs(a_range: range, n: int) -> Dict[int, List[Tuple[int, int]]]:
+    """Groups every pair (a, b), for a in ``a_range`` and 1 <= b <= ``n``, by
+    a ** 3 + b ** 3.
+    """
+    cubes = [i ** 3 for i in range(n + 1)]
+    pairs = defaultdict(list)
+    for a in a_range:
+        a_cubed = cubes[a]
+        for b in range(1, n + 1):
+            pairs[a_cubed + cubes[b]].append((a, b))
+    return pairs
+
+
+def _pair_matches(
+    groups: Iterable[List[Tuple[int, int]]]
+) -> Iterator[Tuple[int, int, int, int]]:
+    for pairs in groups:
+        for a, b in pairs:
+            for c, d in pairs:
+                yield a, b, c, d
+
+
+def solve_ab_eq_cd_2(n: int) -> Iterator[Tuple[int, int, int, int]]:
+    """Lazily yields every (a, b, c, d) with 1 <= a, b, c, d <= ``n`` where
+    a ** 3 + b ** 3 == c ** 3 + d ** 3.
+    """
+    yield from _pair_matches(_cube_sum_pairs(range(1, n + 1), n).values())
+
+
+def solve_ab_eq_cd_np(n: int) -> Iterator[Tuple[int, int, int, int]]:
+    """As `solve_ab_eq_cd_2`, but the n x n table of cube sums is built and
+    grouped with NumPy. Requires 2 * n ** 3 to fit in an int64.
+    """
+    cubes = np.arange(1, n + 1, dtype=np.int64) ** 3
+    sums = (cubes[:, None] + cubes[None, :]).ravel()
+    order = np.argsort(sums, kind="stable")
+    sorted_sums = sums[order]
+
+    # Pair every position in the sorted table with every position in its group.
+    group_starts = np.flatnonzero(np.r_[True, sorted_sums[1:] != sorted_sums[:-1]])
+    group_sizes = np.diff(np.r_[group_starts, len(sorted_sums)])
+    starts = np.repeat(group_starts, group_sizes)
+    sizes = np.repeat(group_sizes, group_sizes)
+    left = np.repeat(np.arange(len(sorted_sums)), sizes)
+    offsets = np.arange(len(left)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    right = np.repeat(starts, sizes) + offsets
+
+    a_s, b_s = np.divmod(order[left], n)
+    c_s, d_s = np.divmod(order[right], n)
+    yield from zip(
+        (a_s + 1).tolist(), (b_s + 1).tolist(), (c_s + 1).tolist(), (d_s + 1).tolist()
+    )
+
+
+def solve_ab_eq_cd_parallel(
+    n: int, workers: Optional[int] = None
+) -> Iterator[Tuple[int, int, int, int]]:
+    """As `solve_ab_eq_cd_2`, but the range of a is split between a pool of
+    ``workers`` processes which each group their share of the pairs.
+    """
+    workers = workers or os.cpu_count() or 1
+    step = max(1, -(-n // (workers * 4)))
+    a_ranges = [range(lo, min(lo + step, n + 1)) for lo in range(1, n + 1, step)]
+    merged = defaultdict(list)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(_cube_sum_pairs, a_ranges, [n] * len(a_ranges)):
+            for cube_sum, pairs in partial.items():
+                merged[cube_sum].extend(pairs)
+
+    yield from _pair_matches(merged.values())
+
+
+def benchmark_ab_eq_cd(
+    ns: Iterable[int] = (10, 50, 100, 200), repeat: int = 3, brute_max_n: int = 50
+) -> None:
+    """Prints the best of ``repeat`` run times for each solver and each n in
+    ``ns``. The O(n ** 3) `solve_ab_eq_cd` is skipped above ``brute_max_n``.
+    """
+    solvers = {
+        "solve_ab_eq_cd": solve_ab_eq_cd,
+        "solve_ab_eq_cd_2": solve_ab_eq_cd_2,
+        "solve_ab_eq_cd_np": solve_ab_eq_cd_np,
+        "solve_ab_eq_cd_parallel": solve_ab_eq_cd_parallel,
+    }
+
+    def run(solver, n):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in solver(n) or ():
+                pass
+
+    print(f"{'n':<8}" + "".join(f"{name:>26}" for name in solvers))
+    for n in ns:
+        row = f"{n:<8}"
+        for name, solver in solvers.items():
+            if solver is solve_ab_eq_cd and n > brute_max_n:
+                row += f"{'-':>26}"
+                continue
+            best = min(timeit.repeat(lambda: run(solver, n), repeat=repeat, number=1))
+            row += f"{best:>26.5f}"
+        print(row)
+
+
+# for match in solve_ab_eq_cd_2(100):
+#     print(match)
+# benchmark_ab_eq_cd()
+
+# n     solve_ab_eq_cd  solve_ab_eq_cd_2  solve_ab_eq_cd_np  solve_ab_eq_cd_parallel
+# 10           0.00117           0.00009            0.00016                  0.01027
+# 50           0.14628           0.00199            0.00105                  0.01780
+# 100                -           0.00844            0.00429                  0.03826
+# 200                -           0.04510            0.02121                  0.13310
+# 400                -           0.19304            0.10903                  0.56230
+# The process pool only pays off once building the groups outweighs sending
+# them back to the parent process.